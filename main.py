@@ -1,18 +1,86 @@
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, validator
-from typing import Optional, Dict, List
-from hashlib import sha256
+from typing import Optional, Dict, List, Tuple
+import hashlib
 from datetime import datetime
+from dataclasses import dataclass
+from collections import Counter, defaultdict
+from functools import lru_cache
+from bisect import bisect_left, bisect_right
+from array import array
+import asyncio
+import itertools
 import re
 import uvicorn
 
 # Initialize FastAPI application with a title
-app = FastAPI(title="String Analyzer API") 
+# Responses are serialized with orjson. Handlers that return plain objects still
+# pass through FastAPI's jsonable_encoder first, so the record-returning
+# endpoints return ORJSONResponse directly to skip it.
+app = FastAPI(title="String Analyzer API", default_response_class=ORJSONResponse)
 
-# In-memory store for strings keyed by sha256 hash
+# SHA-256 backend used for record ids.
+# hashlib binds to OpenSSL when it is available, and OpenSSL dispatches at
+# runtime to the SHA-NI (x86) or ARMv8 Crypto instructions when the CPU
+# supports them, falling back to portable code otherwise.
+# Ids must stay SHA-256: clients read them back as "sha256_hash" and can
+# recompute them, so a faster non-SHA hash (e.g. BLAKE3) is not a drop-in.
+_sha256 = hashlib.sha256
+
+# Returns the raw 32-byte SHA-256 digest of the given bytes
+def sha256_digest(data: bytes) -> bytes:
+    return _sha256(data).digest()
+
+# Returns one SHA-256 digest per input, in order (used by bulk inserts)
+def sha256_batch(items: List[bytes]) -> List[bytes]:
+    sha = _sha256  # Bind once so the loop avoids a global lookup per item
+    return [sha(data).digest() for data in items]
+
+# Only values up to this many characters are memoized. The cache keeps strong
+# references to its keys, including values DELETE has already removed from db,
+# so this bound together with maxsize caps the memory the cache can pin
+# (about 4096 x 1024 characters).
+HASH_CACHE_MAX_LEN = 1024
+
+# Memoized raw SHA-256 digest of a short string value. Keyed on the str itself
+# so cache hits skip both the UTF-8 encode and the hash. The mapping is pure,
+# so entries never go stale.
+@lru_cache(maxsize=4096)
+def _cached_digest(s: str) -> bytes:
+    return sha256_digest(s.encode())
+
+# Returns the raw SHA-256 digest of a string value, memoizing short values only
+def _digest_value(s: str) -> bytes:
+    if len(s) <= HASH_CACHE_MAX_LEN:
+        return _cached_digest(s)
+    return sha256_digest(s.encode())
+
+# In-memory store for strings keyed by their raw 32-byte SHA-256 digest.
+# Bytes keys are half the size of the 64-char hex id and cheaper to hash on
+# lookup; the hex form is only kept on the record for the JSON response.
 # This serves as the temporary database for the service.
 db = {}
 
+# Secondary indexes over the filterable properties, kept in sync with db.
+# Each maps a property value to a bucket of the db keys having it. Buckets
+# are dicts used as insertion-ordered sets (values are None), so a query can
+# walk the smallest bucket in insertion order and test membership in the
+# others without any sorting.
+idx_pal = {True: {}, False: {}}
+idx_wc = defaultdict(dict)
+idx_char = defaultdict(dict)  # character -> keys of strings containing it
+# Length index for min_length/max_length range queries, stored column-wise:
+# idx_len_keys holds the lengths sorted ascending in a compact int array,
+# idx_len_seqs the insertion sequence numbers (ascending within each run of
+# equal lengths) and idx_len_ids the matching db keys at the same positions.
+idx_len_keys = array("q")
+idx_len_seqs = array("q")
+idx_len_ids = []
+# Insertion sequence number per key, used to return results in insertion order
+_seq = {}
+_seq_counter = itertools.count()
+
 # Pydantic model for request body validation (POST /strings)
 class StringInput(BaseModel):
     value: str
@@ -28,20 +96,49 @@ class StringInput(BaseModel):
             raise ValueError("Value cannot be empty")
         return v
 
+# Strings at least this long use the half-slice palindrome comparison
+PALINDROME_HALF_COMPARE_MIN = 1024
+
+# Checks if an already case-folded string reads the same forwards and backwards.
+# Short strings use a single reversed copy, which is fastest. Long strings
+# compare the first half with the reversed second half: the two half slices
+# copy as many bytes as one full reversal, but only n/2 characters are compared.
+def _is_palindrome(lower: str) -> bool:
+    if len(lower) < PALINDROME_HALF_COMPARE_MIN:
+        return lower == lower[::-1]
+    half = len(lower) // 2
+    return lower[:half] == lower[:-half - 1:-1]
+
+# Stored record for one analyzed string (the JSON shape returned by the API).
+# slots=True drops the per-instance __dict__ and makes field access a slot
+# lookup. Handlers return records through ORJSONResponse, which serializes
+# slotted dataclasses natively; FastAPI's jsonable_encoder would deep-copy
+# them via dataclasses.asdict first.
+@dataclass(slots=True)
+class Record:
+    id: str
+    value: str
+    properties: Dict
+    created_at: str
+
 # Core function to compute all required string properties
-def analyze_string(s: str) -> Dict:
-    lower = s.lower()  # Used for case-insensitive palindrome check
+def analyze_string(s: str, digest: Optional[bytes] = None) -> Dict:
+    # Calculate character frequency map (Counter does the counting loop in C)
+    char_freq = dict(Counter(s))
+
     length = len(s)
-    is_palindrome = lower == lower[::-1] # Checks if string reads the same forwards and backwards
-    unique_characters = len(set(s))
+    if length < 2:
+        # Empty and single-character strings are palindromes; no folding needed
+        is_palindrome = True
+    else:
+        lower = s.lower()  # Used for case-insensitive palindrome check
+        is_palindrome = _is_palindrome(lower) # Checks if string reads the same forwards and backwards
+    unique_characters = len(char_freq) # Reuses the frequency pass instead of building a set
     word_count = len(s.split()) # Splits by whitespace to count words
-    hash_value = sha256(s.encode()).hexdigest() # SHA-256 for unique ID
-    
-    # Calculate character frequency map
-    char_freq = {}
-    for char in s:
-        char_freq[char] = char_freq.get(char, 0) + 1
-        
+    if digest is None:
+        digest = _digest_value(s)
+    hash_value = digest.hex() # SHA-256 for unique ID
+
     return {
         "length": length,
         "is_palindrome": is_palindrome,
@@ -51,75 +148,312 @@ def analyze_string(s: str) -> Dict:
         "character_frequency_map": char_freq
     }
 
+# Adds a stored record to the secondary indexes under its db key
+def index_record(key: bytes, record: Record):
+    prop = record.properties
+    seq = next(_seq_counter)
+    _seq[key] = seq
+    idx_pal[prop["is_palindrome"]][key] = None
+    idx_wc[prop["word_count"]][key] = None
+    for char in prop["character_frequency_map"]:
+        idx_char[char][key] = None
+    # Insert after any equal lengths so each length run stays in insertion order.
+    # The columns are flat arrays, so each insert memmoves the entries after
+    # pos: O(N) bytes moved per POST, done in C but growing with the store.
+    pos = bisect_right(idx_len_keys, prop["length"])
+    idx_len_keys.insert(pos, prop["length"])
+    idx_len_seqs.insert(pos, seq)
+    idx_len_ids.insert(pos, key)
+
+# Removes a record from the secondary indexes, dropping emptied buckets
+def unindex_record(key: bytes, record: Record):
+    prop = record.properties
+    seq = _seq.pop(key)
+    idx_pal[prop["is_palindrome"]].pop(key, None)
+    _discard_from_bucket(idx_wc, prop["word_count"], key)
+    for char in prop["character_frequency_map"]:
+        _discard_from_bucket(idx_char, char, key)
+    # Seqs ascend within the run of equal lengths, so the slot is found by
+    # binary search instead of scanning every record of the same length
+    lo = bisect_left(idx_len_keys, prop["length"])
+    hi = bisect_right(idx_len_keys, prop["length"], lo)
+    pos = bisect_left(idx_len_seqs, seq, lo, hi)
+    del idx_len_keys[pos]
+    del idx_len_seqs[pos]
+    del idx_len_ids[pos]
+
+def _discard_from_bucket(index: Dict, value, key: bytes):
+    bucket = index.get(value)
+    if bucket is not None:
+        bucket.pop(key, None)
+        if not bucket:
+            del index[value]
+
+# Returns the records matching every given filter, in insertion order
+def query_records(
+    is_palindrome: Optional[bool] = None,
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    word_count: Optional[int] = None,
+    contains_character: Optional[str] = None
+) -> List[Record]:
+    buckets = []
+    if is_palindrome is not None:
+        buckets.append(idx_pal[is_palindrome])
+    if word_count is not None:
+        buckets.append(idx_wc.get(word_count, {}))
+    if contains_character is not None:
+        # One bucket lookup; no per-record character membership test needed
+        buckets.append(idx_char.get(contains_character, {}))
+    has_length = min_length is not None or max_length is not None
+
+    # No filters: every record matches
+    if not buckets and not has_length:
+        return list(db.values())
+
+    # The smallest bucket is the cheapest ordered source to walk
+    buckets.sort(key=len)
+    total = len(db)
+    low = 0 if min_length is None else min_length
+    high = float("inf") if max_length is None else max_length
+
+    keys = None
+    if has_length:
+        # Binary search the sorted length column for the requested range
+        lo = bisect_left(idx_len_keys, low)
+        hi = len(idx_len_keys) if max_length is None else bisect_right(idx_len_keys, max_length)
+        # A narrow range drives: sorting its few (seq, key) pairs back into
+        # insertion order is cheaper than walking any bucket or db
+        if (hi - lo) * 8 < (len(buckets[0]) if buckets else total):
+            keys = [key for _, key in sorted(zip(idx_len_seqs[lo:hi], idx_len_ids[lo:hi]))]
+            narrow_by = buckets
+    if keys is None and buckets and len(buckets[0]) * 4 < total:
+        # A small bucket drives: walk it in insertion order
+        keys = list(buckets[0])
+        narrow_by = buckets[1:]
+
+    if keys is not None:
+        for bucket in narrow_by:
+            keys = [key for key in keys if key in bucket]
+        # Records deleted since the keys were read are skipped
+        records = [record for key in keys if (record := db.get(key)) is not None]
+        if has_length:
+            records = [record for record in records if low <= record.properties["length"] <= high]
+        return records
+
+    # Every source is a large share of db. One pass over a snapshot of db,
+    # testing each record's own properties, beats combining large buckets:
+    # random probes into big sets cost more than reads from the record's small
+    # properties dict. The snapshot is a single C-level copy, so the walk is
+    # safe while other requests insert or delete.
+    hits = []
+    for record in list(db.values()):
+        prop = record.properties
+        if is_palindrome is not None and prop["is_palindrome"] != is_palindrome:
+            continue
+        if has_length and not low <= prop["length"] <= high:
+            continue
+        if word_count is not None and prop["word_count"] != word_count:
+            continue
+        if contains_character is not None and contains_character not in prop["character_frequency_map"]:
+            continue
+        hits.append(record)
+    return hits
+
+# Inputs larger than this many characters are hashed and analyzed in the
+# default thread pool so a long body does not block the event loop;
+# shorter inputs are cheaper to handle inline than to dispatch.
+OFFLOAD_THRESHOLD = 64 * 1024
+
+# Bulk inserts index this many records between yields to the event loop
+INDEX_CHUNK_SIZE = 1000
+
+# Runs a CPU-bound function inline, or in the thread pool for large inputs
+async def run_compute(size: int, func, *args):
+    if size > OFFLOAD_THRESHOLD:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+    return func(*args)
+
+# Hashes and analyzes one value, returning (db key, properties)
+def analyze_value(s: str) -> Tuple[bytes, Dict]:
+    digest = _digest_value(s)
+    return digest, analyze_string(s, digest)
+
+# Hashes a batch of values in one call, then analyzes each with its digest
+def analyze_batch(values: List[str]) -> List[Tuple[bytes, Dict]]:
+    digests = sha256_batch([value.encode() for value in values])
+    return [(digest, analyze_string(value, digest)) for value, digest in zip(values, digests)]
+
 # 1. Create/Analyze String (POST /strings)
 @app.post("/strings", status_code=201)
-def create_string(input: StringInput):
-    props = analyze_string(input.value)
-    hash_id = props["sha256_hash"]
+async def create_string(input: StringInput):
+    key, props = await run_compute(len(input.value), analyze_value, input.value)
     
     # 409 Conflict check: String already exists
-    if hash_id in db:
+    if key in db:
         raise HTTPException(status_code=409, detail="String already exists")
 
     # Format timestamp strictly to required ISO 8601 format (e.g., 2025-08-27T10:00:00Z)
     now_iso = datetime.utcnow().isoformat(timespec='seconds') + "Z"
     
     # Prepare and store the full record
-    record = {
-        "id": hash_id,
-        "value": input.value,
-        "properties": props,
-        "created_at": now_iso
-    }
+    record = Record(props["sha256_hash"], input.value, props, now_iso)
+
+    db[key] = record
+    index_record(key, record)
+    return ORJSONResponse(record, status_code=201)
+
+# 1b. Bulk Create/Analyze Strings (POST /strings/batch)
+@app.post("/strings/batch", status_code=201)
+async def create_strings_bulk(inputs: List[StringInput]):
+    # First pass: hash every value in a single batch call and analyze it
+    values = [item.value for item in inputs]
+    total_size = sum(map(len, values))
+    analyzed = await run_compute(total_size, analyze_batch, values)
+
+    # 409 Conflict check: reject the whole batch if any value already exists
+    # or appears twice in the request, so nothing is partially inserted
+    seen = set()
+    for key, _ in analyzed:
+        if key in db or key in seen:
+            raise HTTPException(status_code=409, detail="String already exists")
+        seen.add(key)
+
+    now_iso = datetime.utcnow().isoformat(timespec='seconds') + "Z"
+
+    # Stage the records in a dict of their own so the insert below is a single
+    # db.update(): CPython grows db's table once for the whole batch instead of
+    # rehashing repeatedly while the records are added one at a time
+    staged = {}
+    for value, (key, props) in zip(values, analyzed):
+        staged[key] = Record(props["sha256_hash"], value, props, now_iso)
+    records = list(staged.values())
+
+    # Second pass: insert the prepared records into the store
+    db.update(staged)
 
-    db[hash_id] = record
-    return record
+    # Index in chunks, yielding to the event loop between them so a large
+    # batch does not stall other requests. A record deleted (or replaced)
+    # while this runs is no longer the one in db and is skipped.
+    items = list(staged.items())
+    for start in range(0, len(items), INDEX_CHUNK_SIZE):
+        for key, record in items[start:start + INDEX_CHUNK_SIZE]:
+            if db.get(key) is record:
+                index_record(key, record)
+        await asyncio.sleep(0)
+
+    # Returned as ORJSONResponse so FastAPI's jsonable_encoder is bypassed;
+    # encoding a large batch runs in the thread pool like the hashing does
+    return await run_compute(total_size, ORJSONResponse, {
+        "data": records,
+        "count": len(records)
+    }, 201)
 
 # Helper function to find a string record by its value (by hashing it)
 def find_string_record(s: str):
-    hash_value = sha256(s.encode()).hexdigest()
-    return db.get(hash_value)
+    return db.get(_digest_value(s))
 
 # 2. Get Specific String (GET /strings/{string_value})
 @app.get("/strings/{string_value}")
-def get_string(string_value: str):
+async def get_string(string_value: str):
     record = find_string_record(string_value)
     
     # 404 Not Found check
     if not record:
         raise HTTPException(status_code=404, detail="String not found")
-    return record
+    return ORJSONResponse(record)
+
+# Projectable fields of a stored record, in the order they are emitted
+RECORD_FIELDS = ("id", "value", "properties", "created_at")
+PROPERTY_FIELDS = (
+    "length",
+    "is_palindrome",
+    "unique_characters",
+    "word_count",
+    "sha256_hash",
+    "character_frequency_map",
+)
+
+# Fields returned by GET /strings when no ?fields= projection is given.
+# The character_frequency_map is left out to keep list responses small;
+# clients that need whole records pass ?fields=*
+DEFAULT_LIST_FIELDS = "id,value,properties.length,properties.is_palindrome,properties.word_count,created_at"
+
+# Helper function to parse a ?fields= value into (record fields, property fields).
+# Returns None for "*", meaning full records.
+def parse_fields(fields: str) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    # 400 Bad Request for an empty projection such as ?fields= or ?fields=,
+    if not names:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    if "*" in names:
+        return None
+
+    top = set()
+    props = set()
+    for name in names:
+        if name.startswith("properties."):
+            prop_name = name[len("properties."):]
+            if prop_name not in PROPERTY_FIELDS:
+                raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+            props.add(prop_name)
+        elif name in RECORD_FIELDS:
+            top.add(name)
+        else:
+            # 400 Bad Request for fields that do not exist on a record
+            raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+
+    # Requesting all of "properties" makes individual property fields redundant
+    if "properties" in top:
+        props = set()
+    elif props:
+        top.add("properties")
+
+    return (
+        tuple(name for name in RECORD_FIELDS if name in top),
+        tuple(name for name in PROPERTY_FIELDS if name in props),
+    )
+
+# Helper function to build a record containing only the projected fields
+def project_record(record: Record, projection: Tuple[Tuple[str, ...], Tuple[str, ...]]) -> Dict:
+    top, props = projection
+    out = {}
+    for name in top:
+        if name == "properties" and props:
+            prop = record.properties
+            out["properties"] = {prop_name: prop[prop_name] for prop_name in props}
+        else:
+            out[name] = getattr(record, name)
+    return out
 
 # 3. Get All Strings with Filtering (GET /strings)
+# The list endpoints do O(N) work (index query, projection, encoding), so they
+# are plain def handlers that FastAPI runs in its thread pool, keeping the
+# event loop free for other requests
 @app.get("/strings")
 def get_all_strings(
     is_palindrome: Optional[bool] = Query(None),
     min_length: Optional[int] = Query(None, ge=0),
     max_length: Optional[int] = Query(None, ge=0),
     word_count: Optional[int] = Query(None, ge=0),
-    contains_character: Optional[str] = Query(None, min_length=1, max_length=1) # Enforces single character
+    contains_character: Optional[str] = Query(None, min_length=1, max_length=1), # Enforces single character
+    fields: str = Query(DEFAULT_LIST_FIELDS) # Comma-separated projection, "*" for full records
 ):
-    results = []
-    
-    for record in db.values():
-        prop = record["properties"]
-        
-        # Apply filters sequentially, skipping record on mismatch
-        if is_palindrome is not None and prop["is_palindrome"] != is_palindrome:
-            continue
-        if min_length is not None and prop["length"] < min_length:
-            continue
-        if max_length is not None and prop["length"] > max_length:
-            continue
-        if word_count is not None and prop["word_count"] != word_count:
-            continue
-        
-        # Check if the character exists in the character frequency map keys
-        if contains_character is not None:
-            if contains_character not in prop["character_frequency_map"]:
-                 continue
+    projection = parse_fields(fields)
 
-        results.append(record)
+    # Resolve matching records through the secondary indexes
+    hits = query_records(
+        is_palindrome=is_palindrome,
+        min_length=min_length,
+        max_length=max_length,
+        word_count=word_count,
+        contains_character=contains_character
+    )
+    if projection is None:
+        results = hits
+    else:
+        results = [project_record(record, projection) for record in hits]
         
     # Build dictionary of applied filters for the response
     filters_applied = {}
@@ -134,12 +468,25 @@ def get_all_strings(
     if contains_character is not None:
         filters_applied["contains_character"] = contains_character
         
-    # Return count and applied filters as required
-    return {
+    # Return count and applied filters as required (ORJSONResponse bypasses
+    # FastAPI's jsonable_encoder, which would dominate on large result sets)
+    return ORJSONResponse({
         "data": results,
         "count": len(results),
         "filters_applied": filters_applied
-    }
+    })
+
+# Keyword phrase -> (filter name, value) table for natural language parsing.
+# "palindrom" matches both "palindrome" and "palindromic".
+_KEYWORDS = (
+    ("single word", ("word_count", 1)),
+    ("one word", ("word_count", 1)),
+    ("palindrom", ("is_palindrome", True)),
+)
+
+# Natural language patterns, compiled once at import time
+_RE_LONGER = re.compile(r"strings longer than (\d+)")
+_RE_LETTER = re.compile(r"containing the letter (\w)")
 
 # Helper function for natural language query parsing
 def parse_natural_language(query: str) -> Dict:
@@ -147,22 +494,19 @@ def parse_natural_language(query: str) -> Dict:
     filters = {}
 
     # Basic keyword parsing
-    if "single word" in lower or "one word" in lower:
-        filters["word_count"] = 1
-    if "palindromic" in lower or "palindrome" in lower:
-        filters["is_palindrome"] = True
+    for phrase, (key, value) in _KEYWORDS:
+        if key not in filters and phrase in lower:
+            filters[key] = value
     
     # Regex for "strings longer than N" -> min_length = N + 1
-    if "strings longer than" in lower:
-        m = re.search(r"strings longer than (\d+)", lower)
-        if m:
-            filters["min_length"] = int(m.group(1)) + 1
+    m = _RE_LONGER.search(lower)
+    if m:
+        filters["min_length"] = int(m.group(1)) + 1
             
     # Regex for "containing the letter W"
-    if "containing the letter" in lower:
-        m = re.search(r"containing the letter (\w)", lower)
-        if m:
-            filters["contains_character"] = m.group(1)
+    m = _RE_LETTER.search(lower)
+    if m:
+        filters["contains_character"] = m.group(1)
             
     # Heuristic for "first vowel" from instructions
     if "first vowel" in lower and "contains_character" not in filters:
@@ -180,49 +524,39 @@ def filter_by_natural_language(query: str):
     parsed_data = parse_natural_language(query)
     filters = parsed_data["parsed_filters"]
     
-    results = []
-    for record in db.values():
-        prop = record["properties"]
+    # Apply parsed filters (word_count, is_palindrome, min_length, contains_character)
+    # through the secondary indexes
+    results = query_records(**filters)
         
-        # Apply parsed filters (word_count, is_palindrome, min_length, contains_character)
-        if "is_palindrome" in filters and prop["is_palindrome"] != filters["is_palindrome"]:
-            continue
-        if "min_length" in filters and prop["length"] < filters["min_length"]:
-            continue
-        if "word_count" in filters and prop["word_count"] != filters["word_count"]:
-            continue
-            
-        # Check character inclusion using the frequency map
-        if "contains_character" in filters:
-            if filters["contains_character"] not in prop["character_frequency_map"]:
-                continue
-                
-        results.append(record)
-        
-    # Return count and interpreted query object as required
-    return {
+    # Return count and interpreted query object as required (ORJSONResponse
+    # bypasses FastAPI's jsonable_encoder)
+    return ORJSONResponse({
         "data": results,
         "count": len(results),
         "interpreted_query": parsed_data
-    }
+    })
 
 # 5. Delete String (DELETE /strings/{string_value})
 @app.delete("/strings/{string_value}", status_code=204)
-def delete_string(string_value: str):
-    record = find_string_record(string_value)
+async def delete_string(string_value: str):
+    key = _digest_value(string_value)
+    record = db.get(key)
     
     # 404 Not Found check
     if not record:
         raise HTTPException(status_code=404, detail="String not found")
         
-    # Delete from in-memory DB
-    del db[record["id"]]
+    # Delete from in-memory DB. A record from a bulk insert that is still being
+    # indexed is not in the indexes yet, so only indexed records are unindexed.
+    del db[key]
+    if key in _seq:
+        unindex_record(key, record)
     # 204 No Content is returned automatically by FastAPI for a successful None return with status_code=204
     return None
 
 # Health Check (NEW)
 @app.get("/health")
-def health_check():
+async def health_check():
     """
     Standard health check endpoint required for deployment monitoring.
     Returns 200 OK if the service is running.